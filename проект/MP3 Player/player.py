@@ -1,36 +1,74 @@
 from __future__ import annotations
 
+import concurrent.futures
+import io
+import os
+import pickle
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from PyQt6 import QtCore, QtGui, QtWidgets, QtMultimedia
 
 
 SUPPORTED_EXTENSIONS = {"mp3", "wav", "flac", "ogg", "m4a", "aac"}
+# Dotted form for cheap str.endswith() filtering
+SUPPORTED_DOT_EXTS = tuple("." + e for e in SUPPORTED_EXTENSIONS)
+# "00".."99" lookup table for time formatting
+_TWO_DIGIT = tuple(f"{i:02d}" for i in range(100))
 
 
-@dataclass
+def _format_time(ms: int) -> str:
+    if ms is None or ms <= 0:
+        return "00:00"
+    seconds = ms // 1000
+    m = seconds // 60
+    s = seconds - m * 60
+    if m < 100:
+        return _TWO_DIGIT[m] + ":" + _TWO_DIGIT[s]
+    return f"{m:02d}:{s:02d}"
+
+
+class _SessionUnpickler(pickle.Unpickler):
+    """Unpickler for the session file: plain lists/strings only, no globals."""
+
+    def find_class(self, module: str, name: str):  # type: ignore[override]
+        raise pickle.UnpicklingError(f"forbidden global in session: {module}.{name}")
+
+
+@dataclass(slots=True, frozen=True)
 class Track:
     """Simple track model.
 
     Attributes:
         path: absolute path to file
         title: display name
+        url: cached QUrl for the file (built once, reused on every play)
     """
 
     path: str
     title: str
+    url: Optional[QtCore.QUrl] = field(default=None, compare=False)
 
     @staticmethod
-    def from_path(path: Path) -> "Track":
-        return Track(path=str(path), title=path.stem)
+    def from_str(path: str) -> "Track":
+        """Build a track from a raw path string (title is the file name without extension)."""
+        title = os.path.splitext(os.path.basename(path))[0]
+        return Track(path=path, title=title, url=QtCore.QUrl.fromLocalFile(path))
 
 
 class Mp3Player(QtWidgets.QMainWindow):
     """Advanced MP3 player with drag & drop and mini-player."""
 
+    # Cached enum values (avoid deep attribute lookups on every event)
+    _PS_PLAYING = QtMultimedia.QMediaPlayer.PlaybackState.PlayingState
+    _PS_PAUSED = QtMultimedia.QMediaPlayer.PlaybackState.PausedState
+    _MS_EOM = QtMultimedia.QMediaPlayer.MediaStatus.EndOfMedia
+
+    # Tracks added to the playlist per event-loop pass when restoring a session
+    _SESSION_CHUNK = 200
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("MP3 Player — PyQt6")
@@ -39,59 +77,141 @@ class Mp3Player(QtWidgets.QMainWindow):
 
         self.tracks: List[Track] = []
         self.current_index: Optional[int] = None
+        self._selected_row = -1  # mirrors the playlist view's current row
         self._seeking = False
+        self._last_ui_update_ms = 0
+        self._last_shown_seconds = -1
+        # Duration changes rarely; keep its formatted string around
+        self._duration_ms = 0
+        self._duration_str = "00:00"
 
         # Use persistent storage in AppData for EXE
         self.data_dir = Path.home() / "AppData" / "Local" / "Mp3PlayerData"
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        self.last_session_file = self.data_dir / "last_session.m3u"
+        # Internal session store is pickled; the old text file is migrated once
+        self.last_session_file = self.data_dir / "last_session.pkl"
+        self._legacy_session_file = self.data_dir / "last_session.m3u"
+        # Hash of what each state file held when loaded/saved (skip unchanged writes)
+        self._saved_hashes: Dict[str, int] = {}
+        # Session paths still waiting to be streamed into the playlist
+        # (None until the session file has been read)
+        self._pending_session: Optional[List[str]] = None
+        self._session_pos = 0
+        self._session_loading = False
 
         self._setup_player()
         self._setup_ui()
         self._connect_signals()
 
-        # Auto-load last session
-        # Load last volume and last track info
-        last_volume = self.data_dir / "last_volume.txt"
-        last_state = self.data_dir / "last_state.txt"
-        if self.last_session_file.exists():
-            try:
-                with open(self.last_session_file, "r", encoding="utf-8") as f:
-                    lines = [line.strip() for line in f.readlines() if line.strip()]
-                for p in lines:
-                    file_path = Path(p)
-                    if file_path.exists():
-                        track = Track.from_path(file_path)
-                        self.tracks.append(track)
-                        self.playlist_widget.addItem(track.title)
-            except Exception:
-                pass
-
         # Load last volume
+        last_volume = self.data_dir / "last_volume.txt"
         if last_volume.exists():
             try:
-                v = float(last_volume.read_text().strip())
+                raw = last_volume.read_text()
+                self._saved_hashes[last_volume.name] = hash(raw)
+                v = float(raw.strip())
                 self.audio_output.setVolume(v)
                 self.volume_slider.setValue(int(v * 100))
             except Exception:
                 pass
 
+        # Auto-load last session after the window has painted
+        self._session_loading = True
+        QtCore.QTimer.singleShot(0, self._load_last_session)
+
+    # -------------------- SESSION --------------------
+
+    def _load_last_session(self) -> None:
+        if not self._session_loading or self._pending_session is not None:
+            return  # already flushed or cancelled
+        self._pending_session = self._read_last_session()
+        self._load_chunk()
+
+    def _read_last_session(self) -> List[str]:
+        """Saved session paths; existence checks happen later, per chunk."""
+        lines: List[str] = []
+        try:
+            if self.last_session_file.exists():
+                raw = self.last_session_file.read_bytes()
+                self._saved_hashes[self.last_session_file.name] = hash(raw)
+                lines = _SessionUnpickler(io.BytesIO(raw)).load()
+                # Only a list of path strings is a valid session
+                if not isinstance(lines, list) or not all(isinstance(p, str) for p in lines):
+                    lines = []
+            elif self._legacy_session_file.exists():
+                text = self._legacy_session_file.read_text(encoding="utf-8", errors="ignore")
+                lines = [s for ln in text.splitlines() if (s := ln.strip())]
+                # Best-effort migration: on failure keep the .m3u for next time
+                try:
+                    self._save_if_changed(self.last_session_file, self._session_bytes(lines))
+                    self._legacy_session_file.unlink()
+                except Exception:
+                    pass
+        except Exception:
+            lines = []
+        return lines
+
+    def _load_chunk(self, flush: bool = False) -> None:
+        """Stream session tracks in chunks so the UI stays responsive.
+
+        Stat calls and Track building happen per chunk too, not up front.
+        With ``flush`` the rest of the session is appended at once.
+        """
+        if not self._session_loading or self._pending_session is None:
+            return
+        pending = self._pending_session
+        start = self._session_pos
+        end = len(pending) if flush else start + self._SESSION_CHUNK
+        finished = True
+        try:
+            self._append_tracks(self._tracks_from_lines(pending[start:end]))
+            self._session_pos = end
+            finished = end >= len(pending)
+        finally:
+            if finished:
+                self._pending_session = []
+                self._session_loading = False
+        if not finished:
+            QtCore.QTimer.singleShot(0, self._load_chunk)
+            return
+        self._restore_last_state()
+
+    def _finish_session_load(self) -> None:
+        """Append whatever is left of the session before the playlist is edited."""
+        if not self._session_loading:
+            return
+        if self._pending_session is None:
+            self._pending_session = self._read_last_session()
+        self._load_chunk(flush=True)
+
+    def _cancel_session_load(self) -> None:
+        """Drop the rest of the session (the playlist is being replaced)."""
+        self._pending_session = []
+        self._session_loading = False
+
+    def _restore_last_state(self) -> None:
         # Load last state (track index and position)
+        if self.current_index is not None:
+            return  # user already started something while loading
+        last_state = self.data_dir / "last_state.txt"
         if last_state.exists():
             try:
-                data = last_state.read_text().split("|")
+                raw = last_state.read_text()
+                self._saved_hashes[last_state.name] = hash(raw)
+                data = raw.split("|")
                 if len(data) == 2:
                     idx, pos = int(data[0]), int(data[1])
                     if 0 <= idx < len(self.tracks):
                         self.current_index = idx
-                        self.playlist_widget.setCurrentRow(idx)
+                        # don't move a highlight the user set while loading
+                        if self._selected_row < 0:
+                            self._set_current_row(idx)
                         self._play_index(idx)
                         self.player.setPosition(pos)
                         self.player.pause()
             except Exception:
                 pass
-                pass
 
     # -------------------- PLAYER --------------------
 
@@ -101,6 +221,12 @@ class Mp3Player(QtWidgets.QMainWindow):
         self.player.setAudioOutput(self.audio_output)
         self.audio_output.setVolume(0.8)
 
+        # Coalesce rapid slider drags into a single seek
+        self._seek_timer = QtCore.QTimer(self)
+        self._seek_timer.setSingleShot(True)
+        self._seek_timer.timeout.connect(self._do_seek)
+        self._pending_seek_ms: Optional[int] = None
+
     # -------------------- UI --------------------
 
     def _setup_ui(self) -> None:
@@ -123,15 +249,19 @@ class Mp3Player(QtWidgets.QMainWindow):
         top_toolbar.addWidget(self.btn_toggle_mini)
         self.main_layout.addLayout(top_toolbar)
 
-        # Middle: playlist and mini-player stacked
-        self.stack = QtWidgets.QStackedWidget()
-
+        # Middle: playlist and mini-player as siblings, only one visible
         # Full widget: playlist + controls
         self.full_widget = QtWidgets.QWidget()
         fw_layout = QtWidgets.QVBoxLayout(self.full_widget)
 
         # Playlist
-        self.playlist_widget = QtWidgets.QListWidget()
+        # Model-backed view: bulk inserts emit a single rowsInserted
+        self._list_model = QtGui.QStandardItemModel(self)
+        self.playlist_widget = QtWidgets.QListView()
+        self.playlist_widget.setModel(self._list_model)
+        self.playlist_widget.setEditTriggers(
+            QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers
+        )
         self.playlist_widget.setSelectionMode(
             QtWidgets.QAbstractItemView.SelectionMode.SingleSelection
         )
@@ -174,10 +304,10 @@ class Mp3Player(QtWidgets.QMainWindow):
         mw_layout.addWidget(self.mini_btn_next)
         mw_layout.addWidget(self.mini_label)
 
-        # Add both to stack
-        self.stack.addWidget(self.full_widget)
-        self.stack.addWidget(self.mini_widget)
-        self.main_layout.addWidget(self.stack)
+        # Add both to the main layout; mini-player starts hidden
+        self.main_layout.addWidget(self.full_widget)
+        self.main_layout.addWidget(self.mini_widget)
+        self.mini_widget.hide()
 
         # Status bar
         self.status = QtWidgets.QStatusBar()
@@ -192,15 +322,18 @@ class Mp3Player(QtWidgets.QMainWindow):
         self.btn_load.clicked.connect(self.load_playlist)
         self.btn_toggle_mini.clicked.connect(self.toggle_mini_mode)
 
-        self.btn_play.clicked.connect(self.play_selected)
+        # Everything lives on the GUI thread: skip auto-connection dispatch
+        direct = QtCore.Qt.ConnectionType.DirectConnection
+        self.btn_play.clicked.connect(self.play_selected, direct)
         self.btn_pause.clicked.connect(self.toggle_pause)
-        self.btn_stop.clicked.connect(self.player.stop)
+        self.btn_stop.clicked.connect(self.player.stop, direct)
 
-        self.mini_btn_play.clicked.connect(self.play_selected)
-        self.mini_btn_prev.clicked.connect(self.play_prev)
-        self.mini_btn_next.clicked.connect(self.play_next)
+        self.mini_btn_play.clicked.connect(self.play_selected, direct)
+        self.mini_btn_prev.clicked.connect(self.play_prev, direct)
+        self.mini_btn_next.clicked.connect(self.play_next, direct)
 
-        self.playlist_widget.itemDoubleClicked.connect(self.on_item_double)
+        self.playlist_widget.doubleClicked.connect(self.on_item_double)
+        self.playlist_widget.selectionModel().currentRowChanged.connect(self._on_row_changed)
 
         self.player.positionChanged.connect(self.on_position_changed)
         self.player.durationChanged.connect(self.on_duration_changed)
@@ -210,9 +343,10 @@ class Mp3Player(QtWidgets.QMainWindow):
         self.seek_slider.sliderReleased.connect(self.on_seek_released)
         self.seek_slider.sliderMoved.connect(self.on_seek_moved)
 
-        self.volume_slider.valueChanged.connect(
-            lambda v: self.audio_output.setVolume(v / 100)
-        )
+        self.volume_slider.valueChanged.connect(self._on_volume_changed)
+
+    def _on_volume_changed(self, v: int) -> None:
+        self.audio_output.setVolume(v * 0.01)
 
     # -------------------- DRAG & DROP --------------------
 
@@ -221,17 +355,17 @@ class Mp3Player(QtWidgets.QMainWindow):
             event.acceptProposedAction()
 
     def dropEvent(self, event: QtGui.QDropEvent) -> None:  # type: ignore
+        self._finish_session_load()
         urls = event.mimeData().urls()
         paths = [u.toLocalFile() for u in urls if u.isLocalFile()]
-        added = 0
+        new_tracks: List[Track] = []
         for p in paths:
-            path_obj = Path(p)
-            if path_obj.is_file() and path_obj.suffix.lower().lstrip('.') in SUPPORTED_EXTENSIONS:
-                track = Track.from_path(path_obj)
-                self.tracks.append(track)
-                self.playlist_widget.addItem(track.title)
-                added += 1
-        self.status.showMessage(f"Добавлено перетаскиванием: {added}", 3000)
+            if not p.lower().endswith(SUPPORTED_DOT_EXTS):
+                continue
+            if os.path.isfile(p):
+                new_tracks.append(Track.from_str(p))
+        self._append_tracks(new_tracks)
+        self.status.showMessage(f"Добавлено перетаскиванием: {len(new_tracks)}", 3000)
 
     # -------------------- ADD / REMOVE TRACKS --------------------
 
@@ -242,30 +376,64 @@ class Mp3Player(QtWidgets.QMainWindow):
             str(Path.home()),
             "Audio (*.mp3 *.wav *.flac *.ogg *.m4a *.aac);;All files (*)",
         )
+        self._finish_session_load()
 
-        added = 0
+        new_tracks: List[Track] = []
         for p in paths:
-            path_obj = Path(p)
-            ext = path_obj.suffix.lower().lstrip('.')
-            if ext not in SUPPORTED_EXTENSIONS:
+            if not p.lower().endswith(SUPPORTED_DOT_EXTS):
                 continue
-            track = Track.from_path(path_obj)
-            self.tracks.append(track)
-            self.playlist_widget.addItem(track.title)
-            added += 1
+            new_tracks.append(Track.from_str(p))
+        self._append_tracks(new_tracks)
 
-        self.status.showMessage(f"Добавлено: {added}", 3000)
+        self.status.showMessage(f"Добавлено: {len(new_tracks)}", 3000)
+
+    @staticmethod
+    def _tracks_from_lines(lines: List[str]) -> List[Track]:
+        """Build tracks for saved paths that still exist.
+
+        Stat calls run in a thread pool so slow disks/network shares
+        overlap instead of blocking one after another.
+        """
+        if not lines:
+            return []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as ex:
+            exists = list(ex.map(os.path.isfile, lines))
+        return [Track.from_str(p) for p, ok in zip(lines, exists) if ok]
+
+    def _on_row_changed(self, current: QtCore.QModelIndex, _previous: QtCore.QModelIndex) -> None:
+        self._selected_row = current.row()
+
+    def _set_current_row(self, row: int) -> None:
+        self.playlist_widget.setCurrentIndex(self._list_model.index(row, 0))
+
+    def _append_tracks(self, new_tracks: List[Track]) -> None:
+        """Append tracks to the playlist in one batch (single repaint)."""
+        if not new_tracks:
+            return
+        self.playlist_widget.setUpdatesEnabled(False)
+        try:
+            items = [QtGui.QStandardItem(t.title) for t in new_tracks]
+            self._list_model.invisibleRootItem().appendRows(items)
+        finally:
+            self.playlist_widget.setUpdatesEnabled(True)
+        self.tracks.extend(new_tracks)
 
     def remove_selected(self) -> None:
-        sel = self.playlist_widget.currentRow()
+        # Read the row before flushing: appending session rows never shifts it
+        sel = self._selected_row
         if sel < 0:
             return
+        self._finish_session_load()
 
         if self.current_index == sel:
             self.player.stop()
             self.current_index = None
+        elif self.current_index is not None and self.current_index > sel:
+            self.current_index -= 1
 
-        self.playlist_widget.takeItem(sel)
+        self._list_model.removeRow(sel)
+        # currentRowChanged fired before the rows shifted; re-sync the cache
+        self._selected_row = self.playlist_widget.currentIndex().row()
         try:
             del self.tracks[sel]
         except IndexError:
@@ -276,10 +444,10 @@ class Mp3Player(QtWidgets.QMainWindow):
     def toggle_pause(self) -> None:
         """Pause button toggles pause/resume and updates its label."""
         state = self.player.playbackState()
-        if state == QtMultimedia.QMediaPlayer.PlaybackState.PlayingState:
+        if state == self._PS_PLAYING:
             self.player.pause()
             self.btn_pause.setText("▶")  # change to resume icon
-        elif state == QtMultimedia.QMediaPlayer.PlaybackState.PausedState:
+        elif state == self._PS_PAUSED:
             self.player.play()
             self.btn_pause.setText("Pause")  # back to pause
         else:
@@ -287,10 +455,10 @@ class Mp3Player(QtWidgets.QMainWindow):
             self.btn_pause.setText("Pause")
 
     def play_selected(self) -> None:
-        row = self.playlist_widget.currentRow()
+        row = self._selected_row
         if row < 0 and self.tracks:
             row = 0
-            self.playlist_widget.setCurrentRow(0)
+            self._set_current_row(0)
 
         if row < 0:
             self.status.showMessage("Плейлист пуст", 2000)
@@ -299,16 +467,15 @@ class Mp3Player(QtWidgets.QMainWindow):
         # --- Resume from pause ---
         if (
             self.current_index == row
-            and self.player.playbackState() == QtMultimedia.QMediaPlayer.PlaybackState.PausedState
+            and self.player.playbackState() == self._PS_PAUSED
         ):
             self.player.play()
             return
 
         self._play_index(row)
 
-    def on_item_double(self, item: QtWidgets.QListWidgetItem) -> None:
-        row = self.playlist_widget.row(item)
-        self._play_index(row)
+    def on_item_double(self, index: QtCore.QModelIndex) -> None:
+        self._play_index(index.row())
 
     def _play_index(self, index: int) -> None:
         try:
@@ -316,7 +483,7 @@ class Mp3Player(QtWidgets.QMainWindow):
         except IndexError:
             return
 
-        url = QtCore.QUrl.fromLocalFile(track.path)
+        url = track.url if track.url is not None else QtCore.QUrl.fromLocalFile(track.path)
         self.player.setSource(url)
         self.player.play()
         self.current_index = index
@@ -328,7 +495,7 @@ class Mp3Player(QtWidgets.QMainWindow):
             return
         nxt = self.current_index + 1
         if nxt < len(self.tracks):
-            self.playlist_widget.setCurrentRow(nxt)
+            self._set_current_row(nxt)
             self._play_index(nxt)
         else:
             self.player.stop()
@@ -338,7 +505,7 @@ class Mp3Player(QtWidgets.QMainWindow):
         if self.current_index is None:
             return
         prev = max(0, self.current_index - 1)
-        self.playlist_widget.setCurrentRow(prev)
+        self._set_current_row(prev)
         self._play_index(prev)
 
     # -------------------- SEEK & TIME --------------------
@@ -346,36 +513,60 @@ class Mp3Player(QtWidgets.QMainWindow):
     def on_position_changed(self, position: int) -> None:
         if self._seeking:
             return
-        duration = self.player.duration()
+        # Skip redundant repaints: update at most every ~200 ms or on a new second
+        sec = position // 1000
+        if (
+            abs(position - self._last_ui_update_ms) < 200
+            and sec == self._last_shown_seconds
+        ):
+            return
+        self._last_ui_update_ms = position
+        self._last_shown_seconds = sec
+        duration = self._duration_ms
         if duration > 0:
             value = int(position / duration * self.seek_slider.maximum())
             self.seek_slider.blockSignals(True)
             self.seek_slider.setValue(value)
             self.seek_slider.blockSignals(False)
-        self.time_label.setText(f"{self._format_time(position)} / {self._format_time(duration)}")
+        self.time_label.setText(_format_time(position) + " / " + self._duration_str)
 
     def on_duration_changed(self, duration: int) -> None:
         # update time label when duration becomes known
-        self.time_label.setText(f"{self._format_time(self.player.position())} / {self._format_time(duration)}")
+        self._duration_ms = duration
+        self._duration_str = _format_time(duration)
+        self.time_label.setText(_format_time(self.player.position()) + " / " + self._duration_str)
 
     def on_seek_pressed(self) -> None:
         self._seeking = True
+        # nothing is redrawn while dragging; force a refresh on the first tick after it
+        self._last_shown_seconds = -1
 
     def on_seek_released(self) -> None:
         self._seeking = False
         self.on_seek_moved(self.seek_slider.value())
+        # flush pending seek so the final position is always honored
+        self._seek_timer.stop()
+        self._do_seek()
 
     def on_seek_moved(self, slider_value: int) -> None:
         duration = self.player.duration()
         if duration <= 0:
             return
         pos = int(slider_value / self.seek_slider.maximum() * duration)
+        self._pending_seek_ms = pos
+        self._seek_timer.start(50)
+
+    def _do_seek(self) -> None:
+        if self._pending_seek_ms is None:
+            return
+        pos = self._pending_seek_ms
+        self._pending_seek_ms = None
         self.player.setPosition(pos)
 
     # -------------------- MEDIA STATUS --------------------
 
     def on_media_status(self, status: QtMultimedia.QMediaPlayer.MediaStatus) -> None:
-        if status == QtMultimedia.QMediaPlayer.MediaStatus.EndOfMedia:
+        if status == self._MS_EOM:
             self.play_next()
 
     # -------------------- PLAYLIST SAVE / LOAD --------------------
@@ -387,13 +578,17 @@ class Mp3Player(QtWidgets.QMainWindow):
         if not path:
             return
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                for t in self.tracks:
-                    f.write(t.path + "\n")
+            Path(path).write_text(self._playlist_text(), encoding="utf-8")
             self.status.showMessage(f"Плейлист сохранён: {path}", 3000)
         except Exception:
             self.status.showMessage("Ошибка сохранения плейлиста", 3000)
 
+    def _playlist_text(self) -> str:
+        """One path per line, built in a single join (one write per file)."""
+        if not self.tracks:
+            return ""
+        return "\n".join(t.path for t in self.tracks) + "\n"
+
     def load_playlist(self) -> None:
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
             self, "Загрузить плейлист", "", "M3U Playlist (*.m3u)"
@@ -401,16 +596,17 @@ class Mp3Player(QtWidgets.QMainWindow):
         if not path:
             return
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                lines = [line.strip() for line in f.readlines() if line.strip()]
-            self.tracks.clear()
-            self.playlist_widget.clear()
-            for p in lines:
-                file_path = Path(p)
-                if file_path.exists():
-                    track = Track.from_path(file_path)
-                    self.tracks.append(track)
-                    self.playlist_widget.addItem(track.title)
+            raw = Path(path).read_text(encoding="utf-8")
+            lines = [s for ln in raw.splitlines() if (s := ln.strip())]
+            new_tracks = self._tracks_from_lines(lines)
+            self._cancel_session_load()
+            self.playlist_widget.setUpdatesEnabled(False)
+            try:
+                self.tracks.clear()
+                self._list_model.removeRows(0, self._list_model.rowCount())
+                self._append_tracks(new_tracks)
+            finally:
+                self.playlist_widget.setUpdatesEnabled(True)
             self.status.showMessage("Плейлист загружен", 3000)
         except Exception:
             self.status.showMessage("Ошибка загрузки плейлиста", 3000)
@@ -418,12 +614,10 @@ class Mp3Player(QtWidgets.QMainWindow):
     # -------------------- MINI-PLAYER --------------------
 
     def toggle_mini_mode(self) -> None:
-        if self.stack.currentWidget() is self.full_widget:
-            self.stack.setCurrentWidget(self.mini_widget)
-            self.btn_toggle_mini.setText("Развернуть")
-        else:
-            self.stack.setCurrentWidget(self.full_widget)
-            self.btn_toggle_mini.setText("Мини-плеер")
+        mini = not self.mini_widget.isHidden()
+        self.mini_widget.setVisible(not mini)
+        self.full_widget.setVisible(mini)
+        self.btn_toggle_mini.setText("Мини-плеер" if mini else "Развернуть")
 
     def _update_mini_label(self) -> None:
         if self.current_index is None:
@@ -434,36 +628,55 @@ class Mp3Player(QtWidgets.QMainWindow):
     # -------------------- UTIL --------------------
 
     @staticmethod
-    def _format_time(ms: int) -> str:
-        if ms is None or ms <= 0:
-            return "00:00"
-        seconds = int(ms / 1000)
-        m, s = divmod(seconds, 60)
-        return f"{m:02d}:{s:02d}"
+    def _session_bytes(paths: List[str]) -> bytes:
+        return pickle.dumps(paths, protocol=5)
+
+    @staticmethod
+    def _atomic_write(path: Path, data: Union[str, bytes]) -> None:
+        """Write via a temp file + os.replace so a crash never leaves a half-written file."""
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        if isinstance(data, bytes):
+            tmp.write_bytes(data)
+        else:
+            tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _save_if_changed(self, path: Path, data: Union[str, bytes]) -> None:
+        h = hash(data)
+        if self._saved_hashes.get(path.name) == h and path.exists():
+            return
+        self._atomic_write(path, data)
+        self._saved_hashes[path.name] = h
 
     def closeEvent(self, event: QtGui.QCloseEvent) -> None:
         """Save session automatically on exit (tracks, volume, current track)."""
-        try:
-            # Сохраняем список треков
-            with open(self.last_session_file, "w", encoding="utf-8") as f:
-                for t in self.tracks:
-                    f.write(t.path + "\n")
-        except Exception:
-            pass
+        # Session still streaming in: the track list is partial, keep the saved one
+        loading = self._session_loading
+        if not loading:
+            try:
+                # Сохраняем список треков
+                self._save_if_changed(
+                    self.last_session_file,
+                    self._session_bytes([t.path for t in self.tracks]),
+                )
+            except Exception:
+                pass
 
         # Сохраняем громкость
         try:
-            (self.data_dir / "last_volume.txt").write_text(str(self.audio_output.volume()))
+            self._save_if_changed(self.data_dir / "last_volume.txt", str(self.audio_output.volume()))
         except Exception:
             pass
 
         # Сохраняем текущий трек и позицию
-        try:
-            idx = self.current_index if self.current_index is not None else -1
-            pos = self.player.position()
-            (self.data_dir / "last_state.txt").write_text(f"{idx}|{pos}")
-        except Exception:
-            pass
+        # (unless the saved state was never restored and nothing is playing)
+        if not (loading and self.current_index is None):
+            try:
+                idx = self.current_index if self.current_index is not None else -1
+                pos = self.player.position()
+                self._save_if_changed(self.data_dir / "last_state.txt", f"{idx}|{pos}")
+            except Exception:
+                pass
 
         event.accept()
 
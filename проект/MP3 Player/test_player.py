@@ -0,0 +1,79 @@
+import os
+import pickle
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PyQt6.QtMultimedia", exc_type=ImportError)
+
+from PyQt6 import QtWidgets  # noqa: E402
+
+import player  # noqa: E402
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    w = player.Mp3Player()
+    yield w
+    w.deleteLater()
+    app.processEvents()
+
+
+def test_remove_selected_removes_highlighted_row(window):
+    window._append_tracks([player.Track(path=f"/x/{n}.mp3", title=n) for n in "abc"])
+    window._set_current_row(0)
+    model = window._list_model
+
+    def highlighted():
+        return model.itemFromIndex(window.playlist_widget.currentIndex()).text()
+
+    removed = []
+    for _ in range(3):
+        removed.append(highlighted())
+        window.remove_selected()
+        titles = [model.item(r).text() for r in range(model.rowCount())]
+        assert removed[-1] not in titles
+        assert [t.title for t in window.tracks] == titles
+    assert removed == ["a", "b", "c"]
+
+
+def _write_session(window, tmp_path, count, state):
+    paths = []
+    for i in range(count):
+        f = tmp_path / f"t{i:03d}.mp3"
+        f.touch()
+        paths.append(str(f))
+    window.last_session_file.write_bytes(pickle.dumps(paths, protocol=5))
+    (window.data_dir / "last_state.txt").write_text(state)
+
+
+def test_remove_during_session_load_keeps_highlight_and_resume_point(window, tmp_path):
+    _write_session(window, tmp_path, 500, "42|1000")
+    window._load_last_session()  # first chunk only
+    assert window._session_loading
+    assert len(window.tracks) == window._SESSION_CHUNK
+
+    window._set_current_row(3)
+    window.remove_selected()
+
+    titles = [t.title for t in window.tracks]
+    assert not window._session_loading
+    assert len(titles) == 499
+    assert "t003" not in titles
+    assert "t042" in titles
+    assert window.tracks[window.current_index].title == "t042"
+
+
+def test_remove_without_selection_during_session_load_is_noop(window, tmp_path):
+    _write_session(window, tmp_path, 500, "42|1000")
+    window._load_last_session()
+
+    window.remove_selected()
+    assert len(window.tracks) == window._SESSION_CHUNK
+
+    window._finish_session_load()
+    assert len(window.tracks) == 500
+    assert window.tracks[window.current_index].title == "t042"